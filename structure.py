@@ -1,10 +1,22 @@
 import os
+import queue
+import shutil
+import sys
+import threading
+from collections import deque
+from functools import partial
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 import git
 
-EMPTY_CHECKBOX_CHAR = "⬜"
-CHECKED_CHAR = "✔"
+EMPTY_CHECKBOX_CHAR = sys.intern("⬜")
+CHECKED_CHAR = sys.intern("✔")
+COPY_BUFFER_SIZE = 1024 * 1024
+POLL_INTERVAL_MS = 50
+VIRTUAL_THRESHOLD = 500
+VIRTUAL_WINDOW = 200
+# Elsewhere sendfile() may only write to sockets; shutil uses the same check
+USE_SENDFILE = hasattr(os, "sendfile") and sys.platform.startswith("linux")
 
 
 class FileSelectorApp:
@@ -14,11 +26,22 @@ class FileSelectorApp:
         self.root.geometry("700x550")
         self.root.resizable(True, True)
 
-        self.file_states = {}
+        self._selected = set()
+        self._selected_files = set()
+        self._git_selected = set()
+        self._git_paths = []
+        self._git_cache = {}
+        self._git_list_key = None
+        self._tree_built_for = None
         self.selection_mode = tk.BooleanVar(value=True)
         self.git_mode = tk.BooleanVar(value=False)
         self.current_dir = os.getcwd()
         self.git_repo = None
+        self._results = queue.Queue()
+        self._virtual_dirs = {}
+        self._toggle_jobs = deque()
+        self._tree_generation = 0
+        self._window_update_pending = False
 
         self.main_frame = ttk.Frame(root, padding="10")
         self.main_frame.pack(fill=tk.BOTH, expand=True)
@@ -27,6 +50,7 @@ class FileSelectorApp:
         self._setup_display()
         self._setup_initial_directory()
         self._bind_events()
+        self._poll_results()
 
     def _setup_controls(self):
         control_frame = ttk.Frame(self.main_frame)
@@ -35,9 +59,10 @@ class FileSelectorApp:
         ttk.Button(
             control_frame, text="Load Directory", command=self.load_directory, width=15
         ).pack(side=tk.LEFT, padx=5)
-        ttk.Button(
+        self.combine_button = ttk.Button(
             control_frame, text="Combine Files", command=self.combine_files, width=15
-        ).pack(side=tk.LEFT, padx=5)
+        )
+        self.combine_button.pack(side=tk.LEFT, padx=5)
 
         ttk.Button(
             control_frame,
@@ -64,7 +89,7 @@ class FileSelectorApp:
 
         self.tree = ttk.Treeview(
             self.display_frame,
-            columns=("Checked", "FullPath"),
+            columns=("Checked", "FullPath", "IsFile"),
             show="tree headings",
             selectmode="none",
         )
@@ -72,6 +97,7 @@ class FileSelectorApp:
         self.tree.heading("Checked", text=CHECKED_CHAR, anchor="center")
         self.tree.column("Checked", width=40, anchor="center")
         self.tree.column("FullPath", width=0, stretch=False)
+        self.tree.column("IsFile", width=0, stretch=False)
 
         self.listbox = tk.Listbox(
             self.display_frame, selectmode="multiple", font=("Courier", 10)
@@ -87,9 +113,8 @@ class FileSelectorApp:
         """Configure scrollbars for the given widget"""
         self.y_scroll.config(command=widget.yview)
         self.x_scroll.config(command=widget.xview)
-        widget.config(
-            yscrollcommand=self.y_scroll.set, xscrollcommand=self.x_scroll.set
-        )
+        yscroll = self._handle_tree_scroll if widget is self.tree else self.y_scroll.set
+        widget.config(yscrollcommand=yscroll, xscrollcommand=self.x_scroll.set)
         self.y_scroll.pack(side=tk.RIGHT, fill=tk.Y)
         self.x_scroll.pack(side=tk.BOTTOM, fill=tk.X)
 
@@ -104,6 +129,7 @@ class FileSelectorApp:
     def _bind_events(self):
         """Bind UI events"""
         self.tree.bind("<ButtonRelease-1>", self._handle_tree_click)
+        self.tree.bind("<<TreeviewOpen>>", self._handle_tree_open)
         self.listbox.bind("<<ListboxSelect>>", self._handle_list_selection)
 
     def toggle_git_mode(self):
@@ -113,7 +139,6 @@ class FileSelectorApp:
         self.y_scroll.pack_forget()
         self.x_scroll.pack_forget()
 
-        self.file_states.clear()
         self._refresh_display()
 
         display_widget = self.listbox if self.git_mode.get() else self.tree
@@ -124,80 +149,386 @@ class FileSelectorApp:
         """Refresh the current display based on mode"""
         if self.git_mode.get():
             self._populate_git_list()
-        else:
+        elif self._tree_built_for != self.current_dir:
+            self._tree_built_for = self.current_dir
+            self._tree_generation += 1
+            self._selected.clear()
+            self._selected_files.clear()
             self.tree.delete(*self.tree.get_children())
-            self._populate_tree(self.current_dir, "")
+            self._virtual_dirs.clear()
+            self._add_placeholder("")
+            self._load_children_async("", self.current_dir)
+
+    def _run_in_background(self, work, done, failed, *args):
+        """Run work(*args) off the Tk thread, then call done(result) or failed(error)"""
+
+        def worker():
+            try:
+                result = work(*args)
+            except Exception as error:
+                self._results.put((failed, error))
+            else:
+                self._results.put((done, result))
+
+        threading.Thread(target=worker, daemon=True).start()
+
+    def _poll_results(self):
+        """Deliver finished background work to its callback on the Tk thread"""
+        try:
+            done, result = self._results.get_nowait()
+        except queue.Empty:
+            self.root.after(POLL_INTERVAL_MS, self._poll_results)
+            return
+        self.root.after(0, self._poll_results)
+        done(result)
+
+    def _scan_tree(self, parent_dir):
+        """Return sorted (name, path, is_dir, is_file) records for a directory"""
+        with os.scandir(parent_dir) as it:
+            entries = list(it)
+
+        # Any stat() needed to resolve entry types happens in inode order for disk
+        # locality. On Windows inode() costs a stat() while the types are free.
+        if os.name == "nt":
+            order = entries
+        else:
+            order = sorted(entries, key=lambda e: e.inode())
+        types = {entry.name: self._entry_types(entry) for entry in order}
+        entries.sort(key=lambda e: e.name)
+
+        return [
+            (
+                # Names like __init__.py repeat across directories; share one copy
+                sys.intern(entry.name),
+                entry.path,
+                *types[entry.name],
+            )
+            for entry in entries
+        ]
 
-    def _populate_tree(self, parent_dir, parent_node):
-        """Populate tree view with directory contents"""
-        if not os.path.isdir(parent_dir):
+    def _entry_types(self, entry):
+        """Return (is_dir, is_file) for a scandir entry, False where unresolvable"""
+        # Each lookup may stat(); a symlink loop or a link into an unreadable
+        # directory must not take the rest of the listing down with it
+        try:
+            is_dir = entry.is_dir(follow_symlinks=False)
+        except OSError:
+            is_dir = False
+        try:
+            is_file = entry.is_file()
+        except OSError:
+            is_file = False
+        return is_dir, is_file
+
+    def _insert_records(self, placeholder, records):
+        """Replace a placeholder with scanned records, unless it was discarded"""
+        if not self.tree.exists(placeholder):
             return
+        parent_node = self.tree.parent(placeholder)
+        self.tree.delete(placeholder)
 
-        for item in sorted(os.listdir(parent_dir)):
-            path = os.path.join(parent_dir, item)
+        if len(records) > VIRTUAL_THRESHOLD:
+            self._virtual_dirs[parent_node] = (records, 0)
+            self._render_window(parent_node, 0)
+        else:
+            self._insert_rows(parent_node, records)
+
+    def _insert_rows(self, parent_node, records, index="end"):
+        """Insert one tree row per scanned record, at index or at the end"""
+        # Detach the scrollbars so Tk does not recompute them on every insert
+        yscroll = self.tree.cget("yscrollcommand")
+        xscroll = self.tree.cget("xscrollcommand")
+        self.tree.configure(yscrollcommand="", xscrollcommand="")
+        for i, (name, path, is_dir, is_file) in enumerate(records):
+            mark = CHECKED_CHAR if path in self._selected else EMPTY_CHECKBOX_CHAR
             node = self.tree.insert(
-                parent_node, "end", text=item, values=(EMPTY_CHECKBOX_CHAR, path)
+                parent_node,
+                index if index == "end" else index + i,
+                text=name,
+                values=(mark, path, "1" if is_file else "0"),
+            )
+            if is_dir:
+                # Real children are loaded when the directory is first opened
+                self._add_placeholder(node)
+        self.tree.configure(yscrollcommand=yscroll, xscrollcommand=xscroll)
+
+    def _render_window(self, node, start):
+        """Show a slice of a large directory, with paging rows around it"""
+        records, old_start = self._virtual_dirs[node]
+        start = max(0, min(start, len(records) - VIRTUAL_WINDOW))
+        end = start + VIRTUAL_WINDOW
+        self._virtual_dirs[node] = (records, start)
+
+        rows = []
+        for child in self.tree.get_children(node):
+            if self.tree.tag_has("paging", child):
+                self.tree.delete(child)
+            else:
+                rows.append(child)
+        old_end = old_start + len(rows)
+
+        if start >= old_end or end <= old_start:
+            self.tree.delete(*rows)
+            self._insert_rows(node, records[start:end])
+        else:
+            # Rows that stay in the window keep their open state and loaded children
+            dropped_above = rows[: max(0, start - old_start)]
+            dropped_below = rows[len(rows) - max(0, old_end - end) :]
+            self.tree.delete(*dropped_above, *dropped_below)
+            if start < old_start:
+                self._insert_rows(node, records[start:old_start], index=0)
+            if end > old_end:
+                self._insert_rows(node, records[old_end:end])
+
+        if start:
+            self.tree.insert(
+                node, 0, text=f"▲ {start} more", tags=("paging", "more_above")
+            )
+        if end < len(records):
+            self.tree.insert(
+                node,
+                "end",
+                text=f"▼ {len(records) - end} more",
+                tags=("paging", "more_below"),
+            )
+
+    def _handle_tree_scroll(self, first, last):
+        """Update the scrollbar and slide windows whose paging rows are visible"""
+        self.y_scroll.set(first, last)
+        if self._virtual_dirs and not self._window_update_pending:
+            self._window_update_pending = True
+            self.root.after_idle(self._update_virtual_windows)
+
+    def _update_virtual_windows(self):
+        """Move a large directory's window when the view reaches its edge"""
+        self._window_update_pending = False
+        for node, (records, start) in list(self._virtual_dirs.items()):
+            if not self.tree.exists(node):
+                del self._virtual_dirs[node]
+                continue
+
+            rows = self.tree.get_children(node)
+            if self.tree.tag_has("more_below", rows[-1]) and self.tree.bbox(rows[-1]):
+                anchor = start + VIRTUAL_WINDOW - 1
+                self._render_window(node, start + VIRTUAL_WINDOW // 2)
+            elif self.tree.tag_has("more_above", rows[0]) and self.tree.bbox(rows[0]):
+                anchor = start
+                self._render_window(node, start - VIRTUAL_WINDOW // 2)
+            else:
+                continue
+
+            # Keep the record that was at the edge of the view on screen
+            new_start = self._virtual_dirs[node][1]
+            self.tree.see(
+                self.tree.get_children(node)[anchor - new_start + bool(new_start)]
             )
-            self.file_states[node] = False
 
-            if os.path.isdir(path):
-                self._populate_tree(path, node)
+    def _add_placeholder(self, node):
+        """Mark a directory node as not loaded yet"""
+        return self.tree.insert(node, "end", text="Loading...", tags=("placeholder",))
+
+    def _get_placeholder(self, node):
+        """Return the placeholder child of a node that is not loaded yet"""
+        children = self.tree.get_children(node)
+        if children and self.tree.tag_has("placeholder", children[0]):
+            return children[0]
+        return None
+
+    def _load_children_async(self, node, path):
+        """Scan a directory off the Tk thread and fill in its placeholder"""
+        placeholder = self._get_placeholder(node)
+        if placeholder:
+            self._run_in_background(
+                self._scan_tree,
+                partial(self._insert_records, placeholder),
+                partial(self._show_scan_error, placeholder),
+                path,
+            )
+
+    def _show_scan_error(self, placeholder, error):
+        """Turn the placeholder of an unreadable directory into an error row"""
+        if self.tree.exists(placeholder):
+            reason = getattr(error, "strerror", None) or error
+            self.tree.item(
+                placeholder,
+                text=f"⚠ Cannot list directory: {reason}",
+                tags=("scan_error",),
+            )
 
     def _populate_git_list(self):
-        """Populate listbox with git-tracked files"""
+        """Populate listbox with git-tracked files, unless it is already current"""
+        key = None
+        if self.git_repo:
+            head = self.git_repo.head
+            key = (
+                self.git_repo.working_tree_dir,
+                head.commit.hexsha if head.is_valid() else None,
+            )
+            if key == self._git_list_key:
+                return
+
+        self._git_list_key = key
         self.listbox.delete(0, tk.END)
-        if not self.git_repo:
+        self._git_selected.clear()
+        self._git_paths = []
+        if not key:
             return
 
-        repo_root = self.git_repo.working_tree_dir
-        for file_path in self.git_repo.git.ls_files().splitlines():
-            full_path = os.path.join(repo_root, file_path)
-            if os.path.exists(full_path):
-                self.listbox.insert(tk.END, file_path)
-                self.file_states[file_path] = False
+        if key not in self._git_cache:
+            output = self.git_repo.git.ls_files(z=True)
+            self._git_cache[key] = [path for path in output.split("\0") if path]
+
+        self._git_paths = self._git_cache[key]
+        self.listbox.insert(tk.END, *self._git_paths)
 
     def _handle_tree_click(self, event):
         """Handle tree item clicks"""
         item = self.tree.identify_row(event.y)
         if not item or self.tree.identify_column(event.x) != "#1":
             return
+        # Placeholder and paging rows have no path and cannot be checked
+        if not self.tree.set(item, "FullPath"):
+            return
         self._toggle_tree_selection(item)
 
+    def _handle_tree_open(self, event):
+        """Load a directory's children the first time it is expanded"""
+        node = self.tree.focus()
+        self._load_children_async(node, self.tree.set(node, "FullPath"))
+
     def _toggle_tree_selection(self, item):
         """Toggle selection state in tree view"""
-        state = not self.file_states[item]
-        self.file_states[item] = state
-        full_path = self.tree.item(item, "values")[1]
-        self.tree.item(
-            item, values=(CHECKED_CHAR if state else EMPTY_CHECKBOX_CHAR, full_path)
-        )
+        path = self.tree.set(item, "FullPath")
+        state = path not in self._selected
+        self._set_checked(path, self.tree.set(item, "IsFile") == "1", state)
+        self.tree.set(item, "Checked", CHECKED_CHAR if state else EMPTY_CHECKBOX_CHAR)
 
         if self.selection_mode.get():
             self._toggle_tree_children(item, state)
 
+    def _set_checked(self, path, is_file, state):
+        """Record the checked state of a path"""
+        if state:
+            self._selected.add(path)
+            if is_file:
+                self._selected_files.add(path)
+        else:
+            self._selected.discard(path)
+            self._selected_files.discard(path)
+
     def _toggle_tree_children(self, parent, state):
-        """Recursively toggle children in tree view"""
-        for child in self.tree.get_children(parent):
-            self.file_states[child] = state
-            full_path = self.tree.item(child, "values")[1]
-            self.tree.item(
-                child,
-                values=(CHECKED_CHAR if state else EMPTY_CHECKBOX_CHAR, full_path),
+        """Toggle loaded descendants now and queue a walk for the unloaded ones"""
+        mark = CHECKED_CHAR if state else EMPTY_CHECKBOX_CHAR
+        records = []
+        dirs = []
+        pending = deque([parent])
+        while pending:
+            node = pending.popleft()
+            if self._get_placeholder(node):
+                dirs.append(self.tree.set(node, "FullPath"))
+            if node in self._virtual_dirs:
+                hidden, start = self._virtual_dirs[node]
+                records.extend(hidden[:start])
+                records.extend(hidden[start + VIRTUAL_WINDOW :])
+            for child in self.tree.get_children(node):
+                path = self.tree.set(child, "FullPath")
+                if not path:
+                    continue
+                self._set_checked(path, self.tree.set(child, "IsFile") == "1", state)
+                self.tree.set(child, "Checked", mark)
+                pending.append(child)
+        self.tree.update_idletasks()
+
+        if records or dirs:
+            # Walks run one at a time so a later toggle always wins
+            self._toggle_jobs.append(
+                (parent, state, self._tree_generation, records, dirs)
             )
-            self._toggle_tree_children(child, state)
+            if len(self._toggle_jobs) == 1:
+                self._start_toggle_walk()
+
+    def _start_toggle_walk(self):
+        """Walk the unloaded part of the oldest queued toggle off the Tk thread"""
+        parent, state, generation, records, dirs = self._toggle_jobs[0]
+        self._run_in_background(
+            self._walk_records,
+            partial(self._finish_toggle_walk, parent, state, generation),
+            self._toggle_walk_failed,
+            records,
+            dirs,
+        )
+
+    def _walk_records(self, records, dirs):
+        """Return every record below records and dirs, plus unreadable directories"""
+        found = list(records)
+        unreadable = []
+        pending = deque(dirs)
+        pending.extend(path for _, path, is_dir, _ in records if is_dir)
+        while pending:
+            path = pending.popleft()
+            try:
+                scanned = self._scan_tree(path)
+            except OSError:
+                unreadable.append(path)
+                continue
+            for record in scanned:
+                found.append(record)
+                if record[2]:
+                    pending.append(record[1])
+        return found, unreadable
+
+    def _finish_toggle_walk(self, parent, state, generation, result):
+        """Apply a finished walk, then start the next queued one"""
+        found, unreadable = result
+        if generation == self._tree_generation:
+            for _, path, _, is_file in found:
+                self._set_checked(path, is_file, state)
+            self._refresh_marks(parent)
+            if unreadable:
+                action = "selected" if state else "deselected"
+                messagebox.showwarning(
+                    "Incomplete Selection",
+                    f"These folders could not be listed, so their contents were "
+                    f"not {action}:\n" + "\n".join(unreadable[:10]),
+                )
+        self._next_toggle_walk()
+
+    def _toggle_walk_failed(self, error):
+        """Report a walk that failed outright, then start the next queued one"""
+        messagebox.showerror("Selection Failed", str(error))
+        self._next_toggle_walk()
+
+    def _next_toggle_walk(self):
+        """Drop the finished walk and start the next queued one, if any"""
+        self._toggle_jobs.popleft()
+        if self._toggle_jobs:
+            self._start_toggle_walk()
+
+    def _refresh_marks(self, parent):
+        """Redraw the checkboxes of rows loaded below parent from the selection"""
+        if not self.tree.exists(parent):
+            return
+        pending = deque(self.tree.get_children(parent))
+        while pending:
+            node = pending.popleft()
+            path = self.tree.set(node, "FullPath")
+            if path:
+                mark = CHECKED_CHAR if path in self._selected else EMPTY_CHECKBOX_CHAR
+                self.tree.set(node, "Checked", mark)
+                pending.extend(self.tree.get_children(node))
 
     def _handle_list_selection(self, event):
         """Handle listbox selection changes"""
-        selected_indices = self.listbox.curselection()
-        for i in range(self.listbox.size()):
-            path = self.listbox.size(i)
-            self.file_states[path] = i in selected_indices
+        self._git_selected = {self._git_paths[i] for i in self.listbox.curselection()}
 
     def load_directory(self):
         """Load a new directory"""
         folder = filedialog.askdirectory()
         if folder:
             self.current_dir = folder
+            self._git_cache.clear()
+            self._git_list_key = None
+            self._tree_built_for = None
             self._setup_initial_directory()
 
     def get_selected_files(self):
@@ -206,17 +537,10 @@ class FileSelectorApp:
             repo_root = (
                 self.git_repo.working_tree_dir if self.git_repo else self.current_dir
             )
-            return [
-                os.path.join(repo_root, path)
-                for path, selected in self.file_states.items()
-                if selected and os.path.isfile(os.path.join(repo_root, path))
-            ]
+            paths = (os.path.join(repo_root, path) for path in self._git_selected)
+            return sorted(path for path in paths if os.path.isfile(path))
 
-        return [
-            self.tree.item(item, "values")[1]
-            for item, selected in self.file_states.items()
-            if selected and os.path.isfile(self.tree.item(item, "values")[1])
-        ]
+        return sorted(self._selected_files)
 
     def combine_files(self):
         """Combine selected files into one"""
@@ -225,16 +549,68 @@ class FileSelectorApp:
             messagebox.showwarning("No Selection", "Please select files to combine")
             return
 
-        output_file_name = "combined_code.txt"
-        with open(output_file_name, "w", encoding="utf-8") as outfile:
-            for file_path in files:
-
-                outfile.write(f"--- {file_path} ---\n")
-                with open(file_path, "r", encoding="utf-8") as infile:
-                    outfile.write(infile.read() + "\n\n")
+        # Only one job may write the output file at a time
+        self.combine_button.state(["disabled"])
+        self._run_in_background(
+            self._write_combined_file,
+            self._combine_finished,
+            self._combine_failed,
+            files,
+        )
 
+    def _combine_finished(self, output_file_name):
+        """Report a completed combine on the Tk thread"""
+        self.combine_button.state(["!disabled"])
         messagebox.showinfo("Success", f"Files combined into {output_file_name}")
 
+    def _combine_failed(self, error):
+        """Report a failed combine on the Tk thread"""
+        self.combine_button.state(["!disabled"])
+        messagebox.showerror("Combine Failed", str(error))
+
+    def _write_combined_file(self, files):
+        """Concatenate files into the output file; runs on a worker thread"""
+        output_file_name = "combined_code.txt"
+        try:
+            with open(output_file_name, "wb", buffering=COPY_BUFFER_SIZE) as outfile:
+                for file_path in files:
+
+                    outfile.write(f"--- {file_path} ---\n".encode("utf-8"))
+                    with open(file_path, "rb") as infile:
+                        self._copy_file_contents(infile, outfile)
+                    outfile.write(b"\n\n")
+        except OSError:
+            # Do not leave a half-written output behind
+            if os.path.exists(output_file_name):
+                os.remove(output_file_name)
+            raise
+        return output_file_name
+
+    def _copy_file_contents(self, infile, outfile):
+        """Append infile to outfile, in-kernel with sendfile() where supported"""
+        offset = 0
+        if USE_SENDFILE:
+            # sendfile() writes straight to the fd, behind the output buffer
+            outfile.flush()
+            size = os.fstat(infile.fileno()).st_size
+            try:
+                while offset < size:
+                    sent = os.sendfile(
+                        outfile.fileno(), infile.fileno(), offset, size - offset
+                    )
+                    if not sent:
+                        break
+                    offset += sent
+            except OSError:
+                # Nothing written yet, so the copy below can still do all of it
+                if offset:
+                    raise
+
+        # Copies whatever sendfile() did not: everything where it is not used or
+        # failed up front, or bytes appended since the fstat() above
+        infile.seek(offset)
+        shutil.copyfileobj(infile, outfile, COPY_BUFFER_SIZE)
+
     def export_selected_tree(self):
         """Export selected items as tree structure"""
         files = self.get_selected_files()
@@ -254,29 +630,42 @@ class FileSelectorApp:
 
     def _generate_tree_string(self, root_path, selected_paths):
         """Generate tree string for selected paths"""
-        tree_dict = {}
-        for path in selected_paths:
-            rel_path = os.path.relpath(path, root_path)
-            parts = rel_path.split(os.sep)
-            current = tree_dict
-            for part in parts:
-                current = current.setdefault(part, {})
-
-        def format_tree(d, prefix=""):
-
-            lines = []
-            items = sorted(d.keys())
-            for i, item in enumerate(items):
-                is_last = i == len(items) - 1
-                branch = "└── " if is_last else "├── "
-
-                lines.append(f"{prefix}{branch}{item}")
-                if d[item]:
-                    new_prefix = prefix + ("    " if is_last else "│   ")
-                    lines.extend(format_tree(d[item], new_prefix))
-            return "\n".join(lines)
-
-        return f"{os.path.basename(root_path)}/\n" + format_tree(tree_dict)
+        paths = sorted(
+            {
+                tuple(os.path.relpath(path, root_path).split(os.sep))
+                for path in selected_paths
+            }
+        )
+        # shared[i] is how many leading parts paths[i] has in common with paths[i - 1]
+        shared = [0]
+        shared.extend(len(os.path.commonprefix(pair)) for pair in zip(paths, paths[1:]))
+
+        # Walk backwards: in sorted order, whether a level still has a sibling
+        # below only depends on the following path
+        blocks = []
+        has_sibling = []
+        for i in range(len(paths) - 1, -1, -1):
+            parts = paths[i]
+            if i + 1 < len(paths):
+                depth = shared[i + 1]
+                del has_sibling[depth:]
+                has_sibling.append(len(paths[i + 1]) > depth)
+            has_sibling.extend([False] * (len(parts) - len(has_sibling)))
+
+            indent = "".join(
+                "│   " if has_sibling[d] else "    " for d in range(shared[i])
+            )
+            block = []
+            for d in range(shared[i], len(parts)):
+                branch = "├── " if has_sibling[d] else "└── "
+                block.append(f"{indent}{branch}{parts[d]}")
+                indent += "│   " if has_sibling[d] else "    "
+            blocks.append(block)
+
+        lines = [f"{os.path.basename(root_path)}/"]
+        for block in reversed(blocks):
+            lines.extend(block)
+        return "\n".join(lines)
 
 
 if __name__ == "__main__":